@@ -20,8 +20,9 @@ imitating a real browser are sent to avoid HTTP 403 errors.
 
 Environment:
   Webhook URLs should be provided either directly in config.yaml or via
-  environment variables.  Placeholders of the form ${VAR_NAME} will be
-  expanded using os.environ at runtime.
+  environment variables.  Placeholders of the form ${VAR_NAME} (or
+  $VAR_NAME), anywhere in the value, will be expanded using os.environ at
+  runtime.
 
 Example config.yaml:
 
@@ -43,22 +44,128 @@ Example config.yaml:
 
 import argparse
 import asyncio
-import json
 import logging
 import os
 import sys
 import time
+from bisect import bisect_right
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from string import Template
+from typing import Any, AsyncIterator, Deque, Dict, List, Mapping, Optional, Tuple, Union
 
 import aiohttp
+import orjson
 import yaml
+from yarl import URL
+
+try:
+    import msgpack
+except ImportError:  # only needed for *.msgpack state files
+    msgpack = None
+
+try:
+    # libyaml-backed loader; ships with the PyYAML wheels on most platforms.
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - pure-Python PyYAML build
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
 
 
 CONFIG_FILE = Path(__file__).with_name("config.yaml")
 STATE_FILE = Path(__file__).with_name("state.json")
 LOGGER = logging.getLogger("chzzk_watcher")
 
+CHZZK_API_BASE = "https://api.chzzk.naver.com"
+LIVE_DETAIL_URL = CHZZK_API_BASE + "/service/v1/channels/{channel_id}/live-detail"
+CHANNEL_URL = CHZZK_API_BASE + "/service/v1/channels/{channel_id}"
+LIVE_STATUS_URL = CHZZK_API_BASE + "/polling/v2/channels/{channel_id}/live-status"
+# live-detail `status` values (upper-cased) that mean the channel is not live.
+_CLOSED_STATUSES = frozenset({"CLOSE", "ENDED", "IDLE"})
+# Standard headers to mimic a browser; Referer and Origin headers help avoid 403.
+BROWSER_HEADERS = {
+    "Referer": "https://chzzk.naver.com/",
+    "Origin": "https://chzzk.naver.com",
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json",
+    "Accept-Language": "ko,en;q=0.8",
+    "Cache-Control": "no-cache",
+}
+DISCORD_HEADERS = {"User-Agent": "chzzk-discord-watcher/1.0", "Content-Type": "application/json"}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Exponential backoff for transient Chzzk failures: 0.3s, 0.6s between 3 attempts.
+RETRY_ATTEMPTS = 3
+RETRY_START_TIMEOUT = 0.3
+RETRY_FACTOR = 2.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the shared HTTP session used for every request in one run.
+
+    All Chzzk calls go to a single host, so the connector keeps connections
+    alive between the fallback endpoints and across streamers instead of
+    paying a new TLS handshake per request.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=32,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def chzzk_url(template: str, channel_id: str) -> URL:
+    """Build (once per channel) the parsed URL for one of the endpoint templates."""
+    return URL(template.format(channel_id=channel_id))
+
+
+@asynccontextmanager
+async def chzzk_get(
+    session: aiohttp.ClientSession,
+    url: Union[str, URL],
+    headers: Mapping[str, str] = BROWSER_HEADERS,
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """GET a Chzzk endpoint, retrying transient failures with exponential backoff.
+
+    Connection errors and RETRY_STATUSES responses are retried up to
+    RETRY_ATTEMPTS times; the last attempt's response (or exception) is
+    handed to the caller unchanged.  Timeouts are not retried: each attempt
+    may take the full HTTP_TIMEOUT, so retrying a hung endpoint would
+    multiply the worst case instead of recovering from a blip.
+    """
+    delay = RETRY_START_TIMEOUT
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        final = attempt == RETRY_ATTEMPTS
+        try:
+            # Chzzk's API does not redirect; skip aiohttp's redirect handling.
+            resp = await session.get(url, headers=headers, allow_redirects=False)
+        except asyncio.TimeoutError:
+            # Also covers aiohttp.ServerTimeoutError, which is a ClientError too.
+            raise
+        except aiohttp.ClientError as exc:
+            if final:
+                raise
+            LOGGER.debug("GET %s failed (attempt %s): %s", url, attempt, exc)
+        else:
+            if final or resp.status not in RETRY_STATUSES:
+                try:
+                    yield resp
+                finally:
+                    resp.release()
+                return
+            LOGGER.debug("GET %s returned HTTP %s (attempt %s)", url, resp.status, attempt)
+            resp.release()
+        await asyncio.sleep(delay)
+        delay *= RETRY_FACTOR
+
 
 def setup_logging(verbose: bool = False) -> None:
     """Configure process-wide logging."""
@@ -78,39 +185,18 @@ def env_bool(name: str, default: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
-async def fetch_live_info(session: aiohttp.ClientSession, channel_id: str) -> Dict[str, Any]:
-    """Query Chzzk endpoints to obtain current live status and metadata.
-
-    Returns a dictionary with at least the key `is_live`.  When available,
-    additional keys include `title`, `category`, `viewers` (concurrent
-    viewer count) and `status` (raw status string from API).
-    """
-    base = "https://api.chzzk.naver.com"
-    # Standard headers to mimic a browser; Referer and Origin headers help avoid 403.
-    headers = {
-        "Referer": "https://chzzk.naver.com/",
-        "Origin": "https://chzzk.naver.com",
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-        "Accept-Language": "ko,en;q=0.8",
-        "Cache-Control": "no-cache",
-    }
-
-    # First attempt: service/v1/channels/{id}/live-detail
-    url_live_detail = f"{base}/service/v1/channels/{channel_id}/live-detail"
+async def _try_live_detail(session: aiohttp.ClientSession, channel_id: str) -> Optional[Dict[str, Any]]:
+    """Query service/v1/channels/{id}/live-detail; richest payload, preferred."""
+    url_live_detail = chzzk_url(LIVE_DETAIL_URL, channel_id)
     try:
-        async with session.get(url_live_detail, headers=headers, timeout=10) as resp:
+        async with chzzk_get(session, url_live_detail) as resp:
             if resp.status == 200:
-                data = await resp.json()
-                content = data.get("content") or {}
+                content = orjson.loads(await resp.read()).get("content") or {}
                 status = content.get("status")
                 # Determine live flag from status field.
                 is_live = False
                 if status:
-                    is_live = status.upper() not in ("CLOSE", "ENDED", "IDLE")
+                    is_live = status.upper() not in _CLOSED_STATUSES
                 title = content.get("liveTitle")
                 # Prefer localized category value, fall back to slug.
                 category = content.get("liveCategoryValue") or content.get("liveCategory")
@@ -125,14 +211,16 @@ async def fetch_live_info(session: aiohttp.ClientSession, channel_id: str) -> Di
             LOGGER.debug("live-detail returned HTTP %s for channel=%s", resp.status, channel_id)
     except Exception as exc:
         LOGGER.warning("live-detail request failed for channel=%s: %s", channel_id, exc)
+    return None
+
 
-    # Second attempt: service/v1/channels/{id}
-    url_channel = f"{base}/service/v1/channels/{channel_id}"
+async def _try_channel(session: aiohttp.ClientSession, channel_id: str) -> Optional[Dict[str, Any]]:
+    """Query service/v1/channels/{id}; live flag only."""
+    url_channel = chzzk_url(CHANNEL_URL, channel_id)
     try:
-        async with session.get(url_channel, headers=headers, timeout=10) as resp:
+        async with chzzk_get(session, url_channel) as resp:
             if resp.status == 200:
-                data = await resp.json()
-                content = data.get("content") or {}
+                content = orjson.loads(await resp.read()).get("content") or {}
                 # openLive is True when channel is actively streaming
                 is_live = bool(content.get("openLive"))
                 return {
@@ -145,14 +233,16 @@ async def fetch_live_info(session: aiohttp.ClientSession, channel_id: str) -> Di
             LOGGER.debug("channel endpoint returned HTTP %s for channel=%s", resp.status, channel_id)
     except Exception as exc:
         LOGGER.warning("channel request failed for channel=%s: %s", channel_id, exc)
+    return None
 
-    # Third attempt: polling/v2/channels/{id}/live-status (may return just status)
-    url_polling = f"{base}/polling/v2/channels/{channel_id}/live-status"
+
+async def _try_polling(session: aiohttp.ClientSession, channel_id: str) -> Optional[Dict[str, Any]]:
+    """Query polling/v2/channels/{id}/live-status (may return just status)."""
+    url_polling = chzzk_url(LIVE_STATUS_URL, channel_id)
     try:
-        async with session.get(url_polling, headers=headers, timeout=10) as resp:
+        async with chzzk_get(session, url_polling) as resp:
             if resp.status == 200:
-                data = await resp.json()
-                content = data.get("content") or {}
+                content = orjson.loads(await resp.read()).get("content") or {}
                 # status may be ACTIVE / INACTIVE
                 status = content.get("status")
                 is_live = status and status.upper() == "ACTIVE"
@@ -166,11 +256,47 @@ async def fetch_live_info(session: aiohttp.ClientSession, channel_id: str) -> Di
             LOGGER.debug("live-status returned HTTP %s for channel=%s", resp.status, channel_id)
     except Exception as exc:
         LOGGER.warning("live-status request failed for channel=%s: %s", channel_id, exc)
+    return None
+
 
+async def fetch_live_info(session: aiohttp.ClientSession, channel_id: str) -> Dict[str, Any]:
+    """Query Chzzk endpoints to obtain current live status and metadata.
+
+    live-detail is tried first; the channel and live-status endpoints are
+    only queried, in that order, when it fails.
+
+    Returns a dictionary with at least the key `is_live`.  When available,
+    additional keys include `title`, `category`, `viewers` (concurrent
+    viewer count) and `status` (raw status string from API).
+    """
+    for fetch in (_try_live_detail, _try_channel, _try_polling):
+        result = await fetch(session, channel_id)
+        if result is not None:
+            return result
     # Avoid turning transient API/network failures into false "stream ended" events.
     return {"is_live": False, "fetch_error": True}
 
 
+async def fetch_live_info_once(
+    session: aiohttp.ClientSession,
+    channel_id: str,
+    cache: Optional[Dict[str, "asyncio.Task[Dict[str, Any]]"]] = None,
+) -> Dict[str, Any]:
+    """fetch_live_info, shared between streamers configured with the same channel.
+
+    `cache` maps channel_id to the in-flight (or finished) fetch task and is
+    meant to live for one watcher cycle.  Callers get their own copy of the
+    result because process_streamer fills in metadata in place.
+    """
+    if cache is None:
+        return await fetch_live_info(session, channel_id)
+    task = cache.get(channel_id)
+    if task is None:
+        task = asyncio.create_task(fetch_live_info(session, channel_id))
+        cache[channel_id] = task
+    return dict(await task)
+
+
 async def enrich_live_meta(
     session: aiohttp.ClientSession,
     channel_id: str,
@@ -181,27 +307,14 @@ async def enrich_live_meta(
     title/category가 비어 있을 때 짧게 재시도하며 채워 넣는다.
     live-detail 우선, 없으면 live-status 폴백. (점증 백오프)
     """
-    base = "https://api.chzzk.naver.com"
-    headers = {
-        "Referer": "https://chzzk.naver.com/",
-        "Origin": "https://chzzk.naver.com",
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-        "Accept-Language": "ko,en;q=0.8",
-        "Cache-Control": "no-cache",
-    }
     for i in range(tries):
         title = None
         category = None
         # 1) live-detail
         try:
-            async with session.get(f"{base}/service/v1/channels/{channel_id}/live-detail", headers=headers, timeout=10) as r:
+            async with chzzk_get(session, chzzk_url(LIVE_DETAIL_URL, channel_id)) as r:
                 if r.status == 200:
-                    d = await r.json()
-                    c = d.get("content") or {}
+                    c = orjson.loads(await r.read()).get("content") or {}
                     title = c.get("liveTitle") or c.get("title")
                     category = c.get("liveCategoryValue") or c.get("videoCategoryValue") or c.get("categoryType") or c.get("liveCategory")
         except Exception as exc:
@@ -209,10 +322,9 @@ async def enrich_live_meta(
         # 2) live-status (보강)
         if not title or not category:
             try:
-                async with session.get(f"{base}/polling/v2/channels/{channel_id}/live-status", headers=headers, timeout=10) as r:
+                async with chzzk_get(session, chzzk_url(LIVE_STATUS_URL, channel_id)) as r:
                     if r.status == 200:
-                        d = await r.json()
-                        c = d.get("content") or {}
+                        c = orjson.loads(await r.read()).get("content") or {}
                         title = title or c.get("liveTitle")
                         category = category or c.get("liveCategoryValue") or c.get("liveCategory")
             except Exception as exc:
@@ -226,31 +338,52 @@ async def enrich_live_meta(
 def load_config(path: Path) -> Dict[str, Any]:
     """Load YAML configuration file and substitute environment variables."""
     with path.open("r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=YamlLoader)
     if cfg is None:
         cfg = {}
 
     # Expand environment variables in webhook URLs
     for streamer in cfg.get("streamers", []):
         webhook = streamer.get("webhook_url")
-        if isinstance(webhook, str) and "${" in webhook:
-            # Simple variable expansion: ${VAR_NAME}
-            key = webhook.strip()[2:-1]
-            env_val = os.environ.get(key)
-            if env_val:
-                streamer["webhook_url"] = env_val
-            else:
-                LOGGER.warning("Webhook environment variable %s is not set for %s", key, streamer.get("name"))
+        if isinstance(webhook, str) and "$" in webhook:
+            # Expand $VAR / ${VAR} placeholders anywhere in the string
+            template = Template(webhook.strip())
+            missing = [key for key in template.get_identifiers() if not os.environ.get(key)]
+            if missing:
+                LOGGER.warning(
+                    "Webhook environment variable %s is not set for %s",
+                    ", ".join(missing),
+                    streamer.get("name"),
+                )
                 streamer["webhook_url"] = None
+            else:
+                streamer["webhook_url"] = template.safe_substitute(os.environ)
     return cfg
 
 
+def is_msgpack_state(path: Path) -> bool:
+    """State files named *.msgpack are stored as MessagePack, anything else as JSON."""
+    return path.suffix == ".msgpack"
+
+
 def load_state(path: Path) -> Dict[str, Any]:
-    """Load persisted state from JSON; if absent, return empty dict."""
-    if path.exists():
+    """Load persisted state; if absent, return empty dict.
+
+    A missing *.msgpack state falls back to the sibling .json file once, so
+    switching STATE_PATH to MessagePack keeps the existing state.
+    """
+    source = path
+    if is_msgpack_state(path) and not path.exists():
+        legacy = path.with_suffix(".json")
+        if legacy.exists():
+            LOGGER.info("Migrating state from %s to %s", legacy, path)
+            source = legacy
+    if source.exists():
         try:
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            data = source.read_bytes()
+            if is_msgpack_state(source):
+                return msgpack.unpackb(data, raw=False)
+            return orjson.loads(data)
         except Exception:
             # ignore corrupt state
             return {}
@@ -258,52 +391,141 @@ def load_state(path: Path) -> Dict[str, Any]:
 
 
 def save_state(path: Path, state: Dict[str, Any]) -> bool:
-    """Persist state to disk."""
+    """Persist state to disk only if its serialized form changed.
+
+    The encoded bytes are compared directly with the current file; for a
+    file this small that is cheaper than hashing both sides.  Returns
+    whether the file was rewritten.
+    """
     old_data = None
     if path.exists():
-        old_data = path.read_text(encoding="utf-8")
-    tmp = path.with_suffix(".json.tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
-        f.write("\n")
-    new_data = tmp.read_text(encoding="utf-8")
+        old_data = path.read_bytes()
+    if is_msgpack_state(path):
+        new_data = msgpack.packb(state, use_bin_type=True)
+    else:
+        # Compact, key-sorted JSON: byte-identical output whenever the state
+        # is unchanged, regardless of dict insertion order.
+        new_data = orjson.dumps(
+            state,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
     if old_data == new_data:
-        tmp.unlink()
         return False
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(new_data)
     tmp.replace(path)
     return True
 
 
+# Offline duration after which `offline_poll_every` starts skipping polls.
+OFFLINE_BACKOFF_AFTER_SECONDS = 3600
+
+# Discord webhook rate limits as (max requests, window seconds).
+DISCORD_RATE_LIMITS: Tuple[Tuple[int, float], ...] = ((5, 2.0), (30, 60.0))
+DISCORD_MAX_RETRIES = 3
+# Discord accepts at most 10 embeds per webhook message.
+DISCORD_MAX_EMBEDS = 10
+
+
+class WebhookLimiter:
+    """Token-bucket style limiter shared by every sender of one run.
+
+    Each webhook gets its own lock, so sends to one webhook go out in FIFO
+    order while different webhooks proceed in parallel, and a deque of recent
+    send timestamps that is checked against DISCORD_RATE_LIMITS.  A 429
+    response pushes the webhook's next allowed send time forward.
+    """
+
+    def __init__(self, limits: Tuple[Tuple[int, float], ...] = DISCORD_RATE_LIMITS) -> None:
+        self.limits = limits
+        self._window = max(window for _, window in limits)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._sent: Dict[str, Deque[float]] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    def lock(self, webhook_url: str) -> asyncio.Lock:
+        if webhook_url not in self._locks:
+            self._locks[webhook_url] = asyncio.Lock()
+        return self._locks[webhook_url]
+
+    def _delay(self, webhook_url: str, now: float) -> float:
+        sent = self._sent.setdefault(webhook_url, deque())
+        while sent and now - sent[0] >= self._window:
+            sent.popleft()
+        delay = self._blocked_until.get(webhook_url, 0.0) - now
+        for max_requests, window in self.limits:
+            recent = [ts for ts in sent if now - ts < window]
+            if len(recent) >= max_requests:
+                delay = max(delay, recent[-max_requests] + window - now)
+        return delay
+
+    async def acquire(self, webhook_url: str) -> None:
+        """Wait until one more request to webhook_url fits every limit.
+
+        Callers must hold lock(webhook_url).
+        """
+        loop = asyncio.get_running_loop()
+        delay = self._delay(webhook_url, loop.time())
+        while delay > 0:
+            LOGGER.debug("Discord rate limit: waiting %.2fs", delay)
+            await asyncio.sleep(delay)
+            delay = self._delay(webhook_url, loop.time())
+        self._sent[webhook_url].append(loop.time())
+
+    def block(self, webhook_url: str, seconds: float) -> None:
+        """Hold back further sends to webhook_url for the given seconds."""
+        until = asyncio.get_running_loop().time() + seconds
+        self._blocked_until[webhook_url] = max(self._blocked_until.get(webhook_url, 0.0), until)
+
+
+async def _retry_after_seconds(resp: aiohttp.ClientResponse) -> float:
+    """Read the back-off duration from a Discord 429 response."""
+    header = resp.headers.get("Retry-After")
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        data = orjson.loads(await resp.read())
+        return float(data.get("retry_after", 1.0))
+    except Exception:
+        return 1.0
+
+
 async def send_discord_message(
     session: aiohttp.ClientSession,
     webhook_url: str,
-    content: str,
-    embed: Optional[Dict[str, Any]],
+    payload: bytes,
     dry_run: bool = False,
+    limiter: Optional[WebhookLimiter] = None,
 ) -> bool:
-    """Send a message to Discord via webhook."""
+    """Post a pre-rendered JSON payload (see render_discord_payload), honoring rate limits."""
     if dry_run:
-        LOGGER.info(
-            "[dry-run] Discord message skipped: content=%r embed_title=%r",
-            content,
-            embed.get("title") if embed else None,
-        )
+        LOGGER.info("[dry-run] Discord message skipped: payload=%s", payload.decode("utf-8"))
         return True
 
-    payload: Dict[str, Any] = {"content": content}
-    if embed:
-        payload["embeds"] = [embed]
-    try:
-        headers = {"User-Agent": "chzzk-discord-watcher/1.0"}
-        async with session.post(webhook_url, json=payload, headers=headers, timeout=10) as resp:
-            if resp.status >= 400:
-                LOGGER.error("Discord webhook returned HTTP %s", resp.status)
+    if limiter is None:
+        limiter = WebhookLimiter()
+    async with limiter.lock(webhook_url):
+        for attempt in range(DISCORD_MAX_RETRIES + 1):
+            await limiter.acquire(webhook_url)
+            try:
+                async with session.post(webhook_url, data=payload, headers=DISCORD_HEADERS) as resp:
+                    if resp.status == 429 and attempt < DISCORD_MAX_RETRIES:
+                        retry_after = await _retry_after_seconds(resp)
+                        LOGGER.warning("Discord webhook rate limited; retrying in %.2fs", retry_after)
+                        limiter.block(webhook_url, retry_after)
+                        continue
+                    if resp.status >= 400:
+                        LOGGER.error("Discord webhook returned HTTP %s", resp.status)
+                        return False
+                    LOGGER.info("Discord webhook delivered: status=%s", resp.status)
+                    return True
+            except Exception as e:
+                LOGGER.error("Discord webhook request failed: %s", e)
                 return False
-            LOGGER.info("Discord webhook delivered: status=%s", resp.status)
-            return True
-    except Exception as e:
-        LOGGER.error("Discord webhook request failed: %s", e)
-        return False
+    return False
 
 
 def format_discord_message(event_type: str, streamer: Dict[str, Any], info: Dict[str, Any], last_state: Dict[str, Any], threshold: Optional[int] = None) -> Dict[str, Any]:
@@ -351,6 +573,19 @@ def format_discord_message(event_type: str, streamer: Dict[str, Any], info: Dict
     return {"content": content, "embed": embed}
 
 
+def render_discord_payload(messages: List[Dict[str, Any]]) -> bytes:
+    """Combine formatted messages into one webhook request body.
+
+    Content lines are joined with newlines and each message contributes its
+    embed; callers keep batches within DISCORD_MAX_EMBEDS.
+    """
+    payload: Dict[str, Any] = {"content": "\n".join(msg["content"] for msg in messages)}
+    embeds = [msg["embed"] for msg in messages if msg["embed"]]
+    if embeds:
+        payload["embeds"] = embeds
+    return orjson.dumps(payload)
+
+
 async def process_streamer(
     session: aiohttp.ClientSession,
     streamer: Dict[str, Any],
@@ -358,8 +593,14 @@ async def process_streamer(
     state: Dict[str, Any],
     dry_run: bool = False,
     persist_viewer_count: bool = False,
+    limiter: Optional[WebhookLimiter] = None,
+    live_info_cache: Optional[Dict[str, "asyncio.Task[Dict[str, Any]]"]] = None,
+    events_log: Optional[List[Dict[str, Any]]] = None,
 ) -> bool:
-    """Fetch current info for a streamer, detect events, send messages, and update state."""
+    """Fetch current info for a streamer, detect events, send messages, and update state.
+
+    Events that were notified are appended to `events_log` when given.
+    """
     channel_id = streamer.get("channel_id")
     if not channel_id:
         LOGGER.error("Skipping streamer without channel_id: %s", streamer.get("name"))
@@ -367,21 +608,26 @@ async def process_streamer(
 
     name = streamer.get("name") or channel_id
     LOGGER.info("Checking streamer=%s channel=%s", name, channel_id)
-    current = await fetch_live_info(session, channel_id)
+    streamer_key = channel_id
+    last = state.get(streamer_key, {})
+    current = await fetch_live_info_once(session, channel_id, live_info_cache)
     if current.get("fetch_error"):
         LOGGER.error("Skipping state update because all Chzzk API attempts failed: streamer=%s", name)
         return False
 
-    streamer_key = channel_id
-    last = state.get(streamer_key, {})
     new_state: Dict[str, Any] = {
         "is_live": current.get("is_live", False),
         "title": current.get("title") or last.get("title"),
         "category": current.get("category") or last.get("category"),
-        "viewers": current.get("viewers") if persist_viewer_count else None,
         # Track which thresholds have been passed; store as list of ints
         "passed_thresholds": last.get("passed_thresholds", []),
     }
+    if persist_viewer_count:
+        new_state["viewers"] = current.get("viewers")
+    if not new_state["is_live"]:
+        new_state["offline_since"] = (
+            last.get("offline_since") if not last.get("is_live") and last.get("offline_since") else int(time.time())
+        )
     events: List[Dict[str, Any]] = []
 
     # --- 마지막 비어있지 않은 메타 보존 ---
@@ -428,15 +674,15 @@ async def process_streamer(
     if new_state["is_live"]:
         viewers = current.get("viewers")
         if viewers is not None and isinstance(viewers, (int, float)):
-            passed = set(new_state.get("passed_thresholds", []))
-            to_pass = []
-            for th in thresholds:
-                if viewers >= th and th not in passed:
-                    to_pass.append(th)
+            # thresholds and passed_thresholds are both ascending, so the newly
+            # crossed ones are a slice between the highest passed and viewers.
+            passed = new_state.get("passed_thresholds", [])
+            start = bisect_right(thresholds, passed[-1]) if passed else 0
+            to_pass = thresholds[start : bisect_right(thresholds, viewers)]
             if to_pass:
                 # Append to passed list
-                new_state["passed_thresholds"] = sorted(passed.union(to_pass))
-                for th in sorted(to_pass):
+                new_state["passed_thresholds"] = passed + to_pass
+                for th in to_pass:
                     events.append({"type": "threshold_cross", "threshold": th})
 
     # --- 알림 메시지에 쓸 메타 보강 ---
@@ -464,17 +710,23 @@ async def process_streamer(
                 cur["category"] = new_state.get("last_nonempty_category") or new_state.get("category")
         return cur
 
-    # Send notifications for each event (with enriched meta)
+    # Send notifications for all events (with enriched meta), batched into as few posts as possible
     webhook = streamer.get("webhook_url")
     if webhook and events:
-        for ev in events:
-            info_for_msg = build_current_for_msg(ev["type"])
-            msg = format_discord_message(ev["type"], streamer, info_for_msg, last, ev.get("threshold"))
-            ok = await send_discord_message(session, webhook, msg["content"], msg["embed"], dry_run=dry_run)
+        messages = [
+            format_discord_message(ev["type"], streamer, build_current_for_msg(ev["type"]), last, ev.get("threshold"))
+            for ev in events
+        ]
+        payloads = [
+            render_discord_payload(messages[i : i + DISCORD_MAX_EMBEDS])
+            for i in range(0, len(messages), DISCORD_MAX_EMBEDS)
+        ]
+        # Post in order and stop at the first failure: state is not saved on
+        # failure, so anything posted after it would be re-sent next run.
+        for payload in payloads:
+            ok = await send_discord_message(session, webhook, payload, dry_run=dry_run, limiter=limiter)
             if not ok:
                 return False
-            # Slight delay between messages to avoid Discord rate limits
-            await asyncio.sleep(1)
     elif events and dry_run:
         LOGGER.info(
             "[dry-run] Events detected but webhook is missing: streamer=%s events=%s",
@@ -496,11 +748,29 @@ async def process_streamer(
 
     # Persist updated state
     state[streamer_key] = new_state
+    if events_log is not None:
+        events_log.extend(events)
     return True
 
 
+def should_poll_now(last: Dict[str, Any], now: float, poll_interval: int, offline_poll_every: int) -> bool:
+    """Decide whether a channel is polled this cycle.
+
+    Channels offline for longer than OFFLINE_BACKOFF_AFTER_SECONDS are only
+    polled once every `offline_poll_every` poll intervals.  The decision is
+    derived from the wall clock rather than a persisted counter so skipped
+    cycles do not rewrite state.json.
+    """
+    if offline_poll_every <= 1 or last.get("is_live"):
+        return True
+    offline_since = last.get("offline_since")
+    if not offline_since or now - offline_since < OFFLINE_BACKOFF_AFTER_SECONDS:
+        return True
+    return int(now // max(poll_interval, 1)) % offline_poll_every == 0
+
+
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run one Chzzk Discord watcher cycle.")
+    parser = argparse.ArgumentParser(description="Run one Chzzk Discord watcher cycle (or watch continuously).")
     parser.add_argument("config", nargs="?", default=os.environ.get("CONFIG_PATH", str(CONFIG_FILE)))
     parser.add_argument("--state", default=os.environ.get("STATE_PATH", str(STATE_FILE)))
     parser.add_argument("--dry-run", action="store_true", default=env_bool("DRY_RUN", False))
@@ -508,55 +778,173 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+async def run_cycle(
+    session: aiohttp.ClientSession,
+    streamers: List[Dict[str, Any]],
+    thresholds: List[int],
+    state: Dict[str, Any],
+    poll_interval: int,
+    offline_poll_every: int = 1,
+    dry_run: bool = False,
+    persist_viewer_count: bool = False,
+    limiter: Optional[WebhookLimiter] = None,
+    events_log: Optional[List[Dict[str, Any]]] = None,
+) -> bool:
+    """Check every due streamer once, updating `state` in place.
+
+    Notified events of all streamers are collected in `events_log` when given.
+    """
+    now = time.time()
+    due = []
+    for s in streamers:
+        if should_poll_now(state.get(s.get("channel_id") or "", {}), now, poll_interval, offline_poll_every):
+            due.append(s)
+        else:
+            LOGGER.info("Skipping long-offline streamer this cycle: streamer=%s", s.get("name"))
+    live_info_cache: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+    tasks = [
+        process_streamer(
+            session,
+            s,
+            thresholds,
+            state,
+            dry_run=dry_run,
+            persist_viewer_count=persist_viewer_count,
+            limiter=limiter,
+            live_info_cache=live_info_cache,
+            events_log=events_log,
+        )
+        for s in due
+    ]
+    results = await asyncio.gather(*tasks)
+    return all(results)
+
+
+async def persist_state(state_path: Path, state: Dict[str, Any], dry_run: bool = False) -> bool:
+    """Save state after a cycle unless running dry; returns whether the file changed."""
+    if dry_run:
+        LOGGER.info("[dry-run] State write skipped: %s", state_path)
+        return False
+    changed = await asyncio.to_thread(save_state, state_path, state)
+    LOGGER.info("State %s: %s", "updated" if changed else "unchanged", state_path)
+    return changed
+
+
+# Delays between cycles in streaming mode: right after a notification event
+# the next cycles follow quickly, then each quiet cycle steps down one tier
+# until poll_interval_seconds is reached.
+STREAMING_BACKOFF_TIERS = (1.0, 2.5, 5.0)
+STREAMING_RECONNECT_DELAY = 10.0
+
+
+async def run_streaming(
+    state_path: Path,
+    state: Dict[str, Any],
+    poll_interval: int,
+    dry_run: bool = False,
+    **cycle_kwargs: Any,
+) -> None:
+    """Watch continuously in one long-lived process.
+
+    Chzzk has no public push channel for live status, so this keeps the
+    HTTP session and webhook limiter alive between cycles and adapts the
+    poll delay with STREAMING_BACKOFF_TIERS.  Unexpected errors tear down
+    the session and reconnect after STREAMING_RECONNECT_DELAY.
+    """
+    tiers = STREAMING_BACKOFF_TIERS + (float(poll_interval),)
+    tier = len(tiers) - 1
+    limiter = WebhookLimiter()
+    while True:
+        try:
+            async with create_session() as session:
+                while True:
+                    events: List[Dict[str, Any]] = []
+                    await run_cycle(
+                        session,
+                        state=state,
+                        poll_interval=poll_interval,
+                        dry_run=dry_run,
+                        limiter=limiter,
+                        events_log=events,
+                        **cycle_kwargs,
+                    )
+                    await persist_state(state_path, state, dry_run=dry_run)
+                    # Only notification events speed polling up; viewer counts and
+                    # other bookkeeping in state change on nearly every cycle.
+                    tier = 0 if events else min(tier + 1, len(tiers) - 1)
+                    LOGGER.debug("Next cycle in %.1fs", tiers[tier])
+                    await asyncio.sleep(tiers[tier])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOGGER.exception("Streaming watcher failed; reconnecting in %.0fs", STREAMING_RECONNECT_DELAY)
+            await asyncio.sleep(STREAMING_RECONNECT_DELAY)
+
+
 async def main() -> int:
     args = parse_args()
     setup_logging(args.verbose)
 
     config_path = Path(args.config)
     state_path = Path(args.state)
-    cfg = load_config(config_path)
+    if is_msgpack_state(state_path) and msgpack is None:
+        LOGGER.error("State file %s needs the msgpack package: pip install msgpack", state_path)
+        return 1
+    cfg = await asyncio.to_thread(load_config, config_path)
     if not cfg:
         LOGGER.error("Config file %s not found or empty.", config_path)
         return 1
+    mode = str(cfg.get("mode", "polling")).lower()
+    if mode not in ("polling", "streaming"):
+        LOGGER.error("Unknown mode %r in %s; expected polling or streaming.", mode, config_path)
+        return 1
     streamers = cfg.get("streamers", [])
     poll_interval = int(cfg.get("poll_interval_seconds", 300))
     thresholds = cfg.get("viewer_thresholds", [])
     persist_viewer_count = bool(cfg.get("persist_viewer_count", False))
+    offline_poll_every = int(cfg.get("offline_poll_every", 1))
     # Ensure thresholds are sorted ascending and unique
     thresholds = sorted(set(int(x) for x in thresholds if isinstance(x, (int, float))))
 
     LOGGER.info(
-        "Starting watcher cycle: streamers=%s thresholds=%s poll_interval_seconds=%s dry_run=%s persist_viewer_count=%s",
+        "Starting watcher: mode=%s streamers=%s thresholds=%s poll_interval_seconds=%s dry_run=%s persist_viewer_count=%s",
+        mode,
         len(streamers),
         thresholds,
         poll_interval,
         args.dry_run,
         persist_viewer_count,
     )
-    state = load_state(state_path)
+    state = await asyncio.to_thread(load_state, state_path)
+
+    if mode == "streaming":
+        await run_streaming(
+            state_path,
+            state,
+            poll_interval,
+            dry_run=args.dry_run,
+            streamers=streamers,
+            thresholds=thresholds,
+            offline_poll_every=offline_poll_every,
+            persist_viewer_count=persist_viewer_count,
+        )
+        return 0
 
-    async with aiohttp.ClientSession() as session:
+    async with create_session() as session:
         # Single run fetch (GitHub Actions will schedule periodically)
-        tasks = [
-            process_streamer(
-                session,
-                s,
-                thresholds,
-                state,
-                dry_run=args.dry_run,
-                persist_viewer_count=persist_viewer_count,
-            )
-            for s in streamers
-        ]
-        results = await asyncio.gather(*tasks)
-    # Save state after run
-    if args.dry_run:
-        changed = False
-        LOGGER.info("[dry-run] State write skipped: %s", state_path)
-    else:
-        changed = save_state(state_path, state)
-        LOGGER.info("State %s: %s", "updated" if changed else "unchanged", state_path)
-    return 0 if all(results) else 1
+        ok = await run_cycle(
+            session,
+            streamers,
+            thresholds,
+            state,
+            poll_interval,
+            offline_poll_every=offline_poll_every,
+            dry_run=args.dry_run,
+            persist_viewer_count=persist_viewer_count,
+            limiter=WebhookLimiter(),
+        )
+    await persist_state(state_path, state, dry_run=args.dry_run)
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":